@@ -29,10 +29,14 @@ import random
 import json
 import logging
 import itertools
+import math
+import shutil
+import sys
 from pathlib import Path
 from ast import literal_eval
 from time import sleep
 from itertools import product
+from typing import Iterable, Iterator
 
 import Project.code_base as cb
 
@@ -41,6 +45,10 @@ __desc__ = "A simplified implementation of Conway's Game of Life."
 
 RESOURCES = Path(__file__).parent / "../_Resources/"
 
+VIEW_NONE, VIEW_FULL, VIEW_VIEWPORT, VIEW_ZOOM = 'none', 'full', 'viewport', 'zoom'  # ways of rendering the world
+DENSITY_GLYPHS = " .:+*@"  # zoomed out glyphs, from an empty block to a fully populated one
+PATTERN_FILE_TYPES = (".rle", ".lif", ".life")  # file types read by load_seed_from_pattern_file
+
 
 # -----------------------------------------
 # IMPLEMENTATIONS FOR HIGHER GRADES, C - B
@@ -57,18 +65,160 @@ def load_seed_from_file(_file_name: str) -> tuple:
         parsed_population: dict = {}
         for key in raw_population:
             if raw_population[key] is not None:
-                # Convert the neighbor strings to tuples
-                neighbours: list = list(tuple(i) for i in raw_population[key]["neighbours"])
+                if "neighbours" in raw_population[key]:
+                    # Convert the neighbor strings to tuples
+                    neighbours: list = list(tuple(i) for i in raw_population[key]["neighbours"])
+                else:  # Saved states leave the neighbours out, as they can be derived from the coordinates
+                    neighbours: list = calc_neighbour_positions(literal_eval(key))
                 parsed_population[literal_eval(key)] = {  # Create the correct population dict from the parsed data
                     "state": raw_population[key]["state"],
                     "neighbours": neighbours
                 }
+                if "age" in raw_population[key]:  # Saved states keep the age, so elders stay elders
+                    parsed_population[literal_eval(key)]["age"] = raw_population[key]["age"]
             else:
                 parsed_population[literal_eval(key)] = cb.STATE_RIM  # If state = None, Rim-cell
         seed: tuple = parsed_population, data["world_size"]  # Parsed population dict and world size from file as tuple
         return seed
 
 
+def load_seed_from_pattern_file(_file_name: str, _world_size: tuple, _offset: tuple = (1, 1)) -> tuple:
+    """ Load population seed from an RLE or Life 1.06 pattern file, with the top left corner of the pattern
+    placed at offset (row, col). Returns tuple: population (dict) and world_size (tuple). """
+    file_path = RESOURCES / _file_name  # Absolute paths replace the resource folder entirely
+
+    with open(file_path, "r") as file:  # The file is consumed line by line, never read in whole
+        pattern_cells: set = set(iter_pattern_cells(file))  # Only the live cells are kept, the rest is implied dead
+
+    # Life 1.06 patterns are usually centered on 0,0, so shift the pattern to start at 0,0 before the offset
+    top: int = min((cell[0] for cell in pattern_cells), default=0)
+    left: int = min((cell[1] for cell in pattern_cells), default=0)
+
+    live_cells: set = set()
+    for row, col in pattern_cells:
+        cell: tuple = (row - top + _offset[0], col - left + _offset[1])
+        # Cells falling on the rim or outside of the world are clipped away
+        if 0 < cell[0] < _world_size[1] - 1 and 0 < cell[1] < _world_size[0] - 1:
+            live_cells.add(cell)
+
+    clipped: int = len(pattern_cells) - len(live_cells)
+    if clipped:  # Making sure that the user knows that the pattern isnt complete
+        print(f"{clipped} of {len(pattern_cells)} live cells in {_file_name} fell outside of the world and were "
+              f"dropped. Try a larger world size or a smaller offset.", file=sys.stderr)
+
+    return populate_world(_world_size, _live_cells=live_cells), _world_size
+
+
+def iter_pattern_cells(_lines: Iterable) -> Iterator[tuple]:
+    """ Yield live cell coordinates (row, col) from pattern file lines, detecting the format by its header. """
+    lines = iter(_lines)
+    first_line: str = next(lines, "")  # Peek the first line to tell the formats apart
+    lines = itertools.chain([first_line], lines)  # Put the peeked line back in front of the stream
+
+    if first_line.strip().lower().startswith("#life 1.06"):
+        return iter_life_106_cells(lines)
+    return iter_rle_cells(lines)
+
+
+def iter_life_106_cells(_lines: Iterable) -> Iterator[tuple]:
+    """ Yield live cell coordinates (row, col) from Life 1.06 lines, each line holding an "x y" pair. """
+    for line_number, line in enumerate(_lines, start=1):
+        line = line.strip()
+        if not line or line.startswith("#"):  # Header and comment lines carry no cells
+            continue
+        try:
+            x, y = line.split()
+            cell: tuple = int(y), int(x)  # The world is indexed by row first, hence the flip
+        except ValueError:  # Wrong amount of values, or values that arent integers
+            raise ValueError(f"Malformed Life 1.06 line {line_number}: '{line}'. Expected an 'x y' pair.")
+        yield cell
+
+
+def iter_rle_cells(_lines: Iterable) -> Iterator[tuple]:
+    """ Yield live cell coordinates (row, col) from RLE lines. Runs are decoded incrementally, so a run
+    count may span several lines without the pattern ever being held in memory. """
+    row: int = 0
+    col: int = 0
+    run: str = ""  # Digits of the run count read so far
+    line_number: int = 0
+    header_seen: bool = False  # Every RLE file starts with a header, anything else is some other format
+
+    for line_number, line in enumerate(_lines, start=1):
+        line = line.strip()
+        if not line or line.startswith("#"):  # Comment lines carry no cells
+            continue
+        if not header_seen:
+            if not (line.startswith("x") and "=" in line):  # The "x = m, y = n" header line carries no cells
+                raise ValueError(f"Unrecognised pattern format at line {line_number}: '{line}'. "
+                                 f"Expected an RLE header 'x = m, y = n' or a '#Life 1.06' header.")
+            header_seen = True
+            continue
+
+        for char in line:
+            if char.isdigit():
+                run += char
+                continue
+
+            count: int = int(run) if run else 1  # A missing run count means a single cell
+            run = ""
+            if char in "b.":  # Dead cells only move the column forward
+                col += count
+            elif char == "$":  # End of row(s), blank rows are expressed as a run count
+                row += count
+                col = 0
+            elif char == "!":  # End of pattern, anything after is ignored
+                return
+            elif char.isalpha():  # "o" in two state patterns, any other letter is treated as alive
+                for i in range(count):
+                    yield row, col + i
+                col += count
+            # Any other character (whitespace etc.) is ignored
+
+    if not header_seen:  # Nothing but comments, or an empty file
+        raise ValueError("Unrecognised pattern format: no RLE header 'x = m, y = n' or '#Life 1.06' header found.")
+    raise ValueError(f"Malformed RLE pattern: the end of the pattern '!' was never reached after {line_number} lines.")
+
+
+def save_population_to_file(_file_name: str, _population: dict, _world_size: tuple) -> Path:
+    """ Save population to file, in the format read by load_seed_from_file but without the neighbours, which are
+    recomputed when loaded. Relative file names are placed in the resource folder. Returns the file path. """
+    # Taking lack of .json into consideration
+    file_name = _file_name if Path(_file_name).suffix == ".json" else _file_name + ".json"
+    file_path = RESOURCES / file_name  # Absolute paths replace the resource folder entirely
+
+    raw_population: dict = {}
+    for key in _population:
+        if _population[key] is not cb.STATE_RIM:
+            raw_population[str(key)] = {  # Tuple keys are stored as strings, to be parsed with literal_eval
+                "state": _population[key]["state"],
+                "age": _population[key].get("age", 0)  # The state of a living cell is derived from its age
+            }
+        else:
+            raw_population[str(key)] = None  # Rim-cell -> state = None
+
+    with open(file_path, "w") as file:  # Open file with write permission
+        # Compact separators, as the file grows with every cell of the world
+        json.dump({"world_size": list(_world_size), "population": raw_population}, file, separators=(",", ":"))
+    return file_path
+
+
+def count_states(_population: dict) -> dict:
+    """ Count the cells of each state in the population, rim cells excluded. """
+    counts: dict = {"population": 0, "alive": 0, "elders": 0, "prime_elders": 0, "dead": 0}
+    for coords in _population:  # Iterate through the dict
+        if _population[coords] is not cb.STATE_RIM:  # Rim cells shouldnt be counted at all
+            counts["population"] += 1
+            if _population[coords]["state"] != cb.STATE_DEAD:  # If state is considered alive
+                counts["alive"] += 1
+                if _population[coords]["state"] == cb.STATE_ELDER:
+                    counts["elders"] += 1
+                elif _population[coords]["state"] == cb.STATE_PRIME_ELDER:
+                    counts["prime_elders"] += 1
+            else:  # If state is dead
+                counts["dead"] += 1
+    return counts
+
+
 def create_logger() -> logging.Logger:
     """ Creates a logging object to be used for reports. """
     file_path = RESOURCES / "gol.log"  # Create file path with file name and path to Resources folder
@@ -81,38 +231,22 @@ def create_logger() -> logging.Logger:
 
 def simulation_decorator(func):
     """ Function decorator, used to run full extent of simulation. """
-    def wrapper(nth_generation: int, population: dict, world_size: tuple):
+    def wrapper(nth_generation: int, population: dict, world_size: tuple, view: dict = None):
         gol_logger = create_logger()  # Get the logger object
         current_population: dict = population  # Dict to contain every new population state
 
         for i in range(0, nth_generation):  # Iterate the specified generation ammount
             cb.clear_console()
-            population_count: int = 0  # Counters of states to be logged
-            alive_count: int = 0
-            elder_count: int = 0
-            prime_elder_count: int = 0
-            dead_count: int = 0
-            for coords in current_population:  # Iterate through the dict
-                if current_population[coords] is not cb.STATE_RIM:  # Rim cells shouldnt be counted at all
-                    population_count += 1
-                    if current_population[coords]["state"] != cb.STATE_DEAD:  # If state is considered alive
-                        alive_count += 1
-                        if current_population[coords]["state"] == cb.STATE_ELDER:
-                            elder_count += 1
-                        elif current_population[coords]["state"] == cb.STATE_PRIME_ELDER:
-                            prime_elder_count += 1
-                    else:  # If state is dead
-                        dead_count += 1
-
+            counts: dict = count_states(current_population)  # Counters of states to be logged
             gol_logger.info(f"GENERATION {i} \n"  # Format and log the cell data per generation
-                            f"  Population: {population_count} \n"
-                            f"  Alive: {alive_count} \n"
-                            f"  Elders: {elder_count} \n"
-                            f"  Prime Elders: {prime_elder_count} \n"
-                            f"  Dead: {dead_count}")
+                            f"  Population: {counts['population']} \n"
+                            f"  Alive: {counts['alive']} \n"
+                            f"  Elders: {counts['elders']} \n"
+                            f"  Prime Elders: {counts['prime_elders']} \n"
+                            f"  Dead: {counts['dead']}")
 
             # Calls the wrapped function (run_simulation) to update the population state
-            current_population = func(i, current_population, world_size)
+            current_population = func(i, current_population, world_size, view)
             sleep(0.2)  # Wait 200ms before next cycle
 
     return wrapper
@@ -144,12 +278,74 @@ def parse_world_size_arg(_arg: str) -> tuple:
     return 80, 40  # Return default values as tuple
 
 
-def populate_world(_world_size: tuple, _seed_pattern: str = None) -> dict:
-    """ Populate the world with cells and initial states. """
+def parse_coords_arg(_arg: str, _name: str, _default: tuple = None) -> tuple:
+    """ Parse row and col coordinates from command argument, e.g. a pattern offset or a viewport origin. """
+    if not _arg:  # Nothing specified, nothing to complain about
+        return _default
+
+    args: list = _arg.split("x")  # Split the coordinate arg into a list by "x"
+
+    try:
+        if len(args) != 2:
+            raise ValueError
+        return int(args[0]), int(args[1])  # Return int-parsed args as tuple
+    except ValueError:
+        print(f"{_name} should contain row and col, separated by ‘x’. Ex: ‘10x20’")
+
+    if _default:
+        print(f"Using default {_name.lower()}: {_default[0]}x{_default[1]}")
+    else:
+        print(f"Ignoring the {_name.lower()}")
+    return _default
+
+
+def create_arg_parser(_desc: str, _file_root_desc: str = "the resource folder") -> argparse.ArgumentParser:
+    """ Create the command argument parser shared by the entry points besides main, with the seed arguments
+    of main plus the placement of pattern files. The file root description tells where -f is resolved. """
+    epilog = "DT179G Project v" + __version__
+    parser = argparse.ArgumentParser(description=_desc, epilog=epilog, add_help=True)
+    parser.add_argument('-g', '--generations', dest='generations', type=int, default=50,
+                        help='Amount of generations the simulation should run. Defaults to 50.')
+    parser.add_argument('-s', '--seed', dest='seed', type=str,
+                        help='Starting seed. If omitted, a randomized seed will be used.')
+    parser.add_argument('-ws', '--worldsize', dest='worldsize', type=str, default='80x40',
+                        help='Size of the world, in terms of width and height. Defaults to 80x40.')
+    parser.add_argument('-f', '--file', dest='file', type=str,
+                        help=f'Load starting seed from file, either JSON, RLE or Life 1.06, relative to '
+                             f'{_file_root_desc}. The program ends if the file cannot be loaded.')
+    parser.add_argument('-of', '--offset', dest='offset', type=str, default='1x1',
+                        help='Placement of a RLE or Life 1.06 pattern, in terms of row and col. Defaults to 1x1.')
+    return parser
+
+
+def create_seed_from_args(_args: argparse.Namespace, _file_root: Path = RESOURCES) -> tuple:
+    """ Create the seed from the arguments of create_arg_parser, loading the file relative to the file root.
+    Returns tuple: population (dict) and world_size (tuple). """
+    if not _args.file:  # Only fall back to a generated world if no file was asked for
+        world_size: tuple = parse_world_size_arg(_args.worldsize)
+        return populate_world(world_size, _args.seed), world_size
+
+    file_name: str = str(_file_root / _args.file)  # Absolute paths replace the file root entirely
+    try:
+        if file_name.lower().endswith(PATTERN_FILE_TYPES):
+            return load_seed_from_pattern_file(file_name, parse_world_size_arg(_args.worldsize),
+                                               parse_coords_arg(_args.offset, "Offset", (1, 1)))
+        return load_seed_from_file(file_name)
+    except (OSError, ValueError, KeyError) as error:  # Carrying on with some other seed would be misleading
+        print(f"Could not load seed from {_args.file}: {error}", file=sys.stderr)
+        sys.exit(1)
+
+
+def populate_world(_world_size: tuple, _seed_pattern: str = None, _live_cells: set = None) -> dict:
+    """ Populate the world with cells and initial states. Live cells, if given, take precedence over the
+    seed pattern. """
     population: dict = {}  # Empty dict to be filled with population data
-    pattern: list = []  # List to be filled with a predefined pattern, if any
-    if _seed_pattern:  # If a pattern has been specified
-        pattern: list = cb.get_pattern(_seed_pattern, _world_size)  # Get the specified pattern
+    pattern: set = None  # Set to be filled with a predefined pattern, if any. A set keeps the lookups cheap
+    if _live_cells is not None:  # If the live cells already are known, e.g. from a pattern file
+        pattern = set(_live_cells)
+    elif _seed_pattern:  # If a pattern has been specified
+        predefined: list = cb.get_pattern(_seed_pattern, _world_size)  # Get the specified pattern
+        pattern = set(predefined) if predefined else None  # Unknown patterns fall back to a random seed
 
     # List every possible world size coordinate on the grid from 0,0 to the specified range
     coords: list = list(product(range(0, _world_size[1]), range(0, _world_size[0])))
@@ -161,7 +357,7 @@ def populate_world(_world_size: tuple, _seed_pattern: str = None) -> dict:
                 or coords[i][1] == _world_size[0] - 1:
             population[coords[i]] = cb.STATE_RIM  # Edge cell -> Rim cell
         else:
-            if pattern:  # If there is a specified pattern
+            if pattern is not None:  # If there is a specified pattern, even an empty one
                 population[coords[i]] = {
                     # Alive cell if existing in pattern, dead if not
                     "state": cb.STATE_ALIVE if coords[i] in pattern else cb.STATE_DEAD,
@@ -197,21 +393,37 @@ def calc_neighbour_positions(_cell_coord: tuple) -> list:
 
 
 @simulation_decorator  # Decorator wrapping the function
-def run_simulation(_generations: int, _population: dict, _world_size: tuple) -> dict:
+def run_simulation(_generations: int, _population: dict, _world_size: tuple, _view: dict = None) -> dict:
     """ Runs a tick in the simulation. """
-    return update_world(_population, _world_size)  # Returns the dict from update_world function
+    return update_world(_population, _world_size, _view)  # Returns the dict from update_world function
 
 
-def update_world(_cur_gen: dict, _world_size: tuple) -> dict:
-    """ Represents a tick in the simulation. """
+def update_world(_cur_gen: dict, _world_size: tuple, _view: dict = None) -> dict:
+    """ Represents a tick in the simulation. The current generation is rendered according to the view, as
+    created by create_view. Without a view, the whole world is rendered. """
+    view: dict = _view if _view else {"mode": VIEW_FULL}
     next_generation: dict = {}  # Dict to contain the next generation
+    centroid_sum: list = [0, 0, 0]  # Sum of living rows, sum of living cols and living count, for following
+    block_counts: dict = {}  # Living cells per block, keyed by block coordinates, for zooming out
     for key in _cur_gen:  # Iterate the current generation
 
-        # Defines the output to be printed
-        out_str: str = cb.get_print_value(cb.STATE_RIM) if _cur_gen[key] is cb.STATE_RIM \
-            else cb.get_print_value(_cur_gen[key]["state"])
-        # Print out_str, line break if cell is a x-row right edge cell
-        cb.progress(out_str + "\n" if key[1] == _world_size[0] - 1 else out_str)
+        if view["mode"] == VIEW_FULL:
+            # Defines the output to be printed
+            out_str: str = cb.get_print_value(cb.STATE_RIM) if _cur_gen[key] is cb.STATE_RIM \
+                else cb.get_print_value(_cur_gen[key]["state"])
+            # Print out_str, line break if cell is a x-row right edge cell
+            cb.progress(out_str + "\n" if key[1] == _world_size[0] - 1 else out_str)
+        elif view["mode"] in (VIEW_VIEWPORT, VIEW_ZOOM) \
+                and _cur_gen[key] is not cb.STATE_RIM and _cur_gen[key]["state"] != cb.STATE_DEAD:
+            # Other views only render a terminal sized output, so the living cells are tallied in this pass
+            # and the output is rendered once the pass is done
+            if view["mode"] == VIEW_VIEWPORT:
+                centroid_sum[0] += key[0]
+                centroid_sum[1] += key[1]
+                centroid_sum[2] += 1
+            elif view["mode"] == VIEW_ZOOM:
+                block: tuple = (key[0] // view["block"][0], key[1] // view["block"][1])
+                block_counts[block] = block_counts.get(block, 0) + 1
 
         # Next gen calculations
         if _cur_gen[key] is cb.STATE_RIM:  # If the cell is a rim, it should continue to be so
@@ -247,9 +459,84 @@ def update_world(_cur_gen: dict, _world_size: tuple) -> dict:
                     "neighbours": _cur_gen[key]["neighbours"],
                     "age": 0  # Age reverted to 0
                 }
+
+    if view["mode"] == VIEW_VIEWPORT:
+        render_viewport(_cur_gen, _world_size, view, centroid_sum)
+    elif view["mode"] == VIEW_ZOOM:
+        render_zoomed(block_counts, _world_size, view)
     return next_generation
 
 
+def create_view(_world_size: tuple, _mode: str = None, _origin: tuple = None) -> dict:
+    """ Create the view used to render the world, sized to the terminal. Without a mode, the whole world is
+    rendered if it fits the terminal, otherwise a viewport following the population centroid. Output that
+    isnt a terminal always gets the whole world. """
+    columns, lines = shutil.get_terminal_size()
+    lines -= 1  # Keep the last line free for the cursor
+
+    if _mode is None:
+        fits: bool = _world_size[0] <= columns and _world_size[1] <= lines
+        _mode = VIEW_FULL if fits or not sys.stdout.isatty() else VIEW_VIEWPORT
+
+    size: tuple = (max(1, min(columns, _world_size[0])), max(1, min(lines, _world_size[1])))  # Width, height
+    return {
+        "mode": _mode,
+        "size": size,
+        "origin": _origin,  # Top left (row, col) of the viewport, None follows the population centroid
+        # Cells aggregated into each glyph (rows, cols) when zoomed out, so that every block fits the terminal
+        "block": (math.ceil(_world_size[1] / size[1]), math.ceil(_world_size[0] / size[0]))
+    }
+
+
+def render_viewport(_population: dict, _world_size: tuple, _view: dict, _centroid_sum: list):
+    """ Render the part of the world that is within the viewport. """
+    width, height = _view["size"]
+
+    if _view["origin"] is not None:
+        top, left = _view["origin"]
+    else:  # Center the viewport on the population centroid, or on the world center if nothing lives
+        living: int = _centroid_sum[2]
+        center: tuple = (_centroid_sum[0] // living, _centroid_sum[1] // living) if living \
+            else (_world_size[1] // 2, _world_size[0] // 2)
+        top, left = center[0] - height // 2, center[1] - width // 2
+
+    # Keep the viewport within the world
+    top = min(max(top, 0), _world_size[1] - height)
+    left = min(max(left, 0), _world_size[0] - width)
+
+    for row in range(top, top + height):
+        out_str: str = ""
+        for col in range(left, left + width):
+            cell = _population[(row, col)]
+            out_str += cb.get_print_value(cb.STATE_RIM) if cell is cb.STATE_RIM \
+                else cb.get_print_value(cell["state"])
+        cb.progress(out_str + "\n")  # Output a row at a time
+
+
+def render_zoomed(_block_counts: dict, _world_size: tuple, _view: dict):
+    """ Render the world zoomed out, each glyph representing the density of living cells within a block. """
+    block_rows, block_cols = _view["block"]
+    last_glyph: int = len(DENSITY_GLYPHS) - 1
+
+    def count_interior(_block: int, _block_size: int, _world_length: int) -> int:
+        """ Count the interior (non rim) cells along one axis of a block, as blocks at the edges are cut short. """
+        return max(0, min((_block + 1) * _block_size, _world_length - 1) - max(_block * _block_size, 1))
+
+    interior_rows: list = [count_interior(row, block_rows, _world_size[1])
+                           for row in range(math.ceil(_world_size[1] / block_rows))]
+    interior_cols: list = [count_interior(col, block_cols, _world_size[0])
+                           for col in range(math.ceil(_world_size[0] / block_cols))]
+
+    for row in range(len(interior_rows)):
+        out_str: str = ""
+        for col in range(len(interior_cols)):
+            block_area: int = interior_rows[row] * interior_cols[col]  # Only the cells that can live
+            # Round the density upwards, so that a block with any living cell at all is visible
+            density: float = _block_counts.get((row, col), 0) / block_area if block_area else 0
+            out_str += DENSITY_GLYPHS[min(last_glyph, math.ceil(density * last_glyph))]
+        cb.progress(out_str + "\n")  # Output a row at a time
+
+
 def count_alive_neighbours(_neighbours: list, _cells: dict) -> int:
     """ Determine how many of the neighbouring cells are currently alive. """
     living: int = 0  # Variable to contain the ammount of living neighbours
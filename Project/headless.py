@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+"""
+Headless fast-forward of the Game of Life, intended for batch jobs.
+
+The seed is created from the same arguments as the interactive simulation in gol.py, but the
+generations are computed at full speed, without any rendering or sleeping in between. Only the
+final state is written to file, followed by a summary of the population and the throughput.
+
+Pattern files in the RLE or Life 1.06 format are placed within the world size given by -ws.
+
+You run this script as a module:
+    python -m Project.headless
+"""
+
+from pathlib import Path
+from time import perf_counter
+
+import Project.gol as gol
+
+__desc__ = "Headless fast-forward of a simplified implementation of Conway's Game of Life."
+
+
+def fast_forward(_generations: int, _population: dict, _world_size: tuple) -> dict:
+    """ Compute the specified amount of generations without rendering. Returns the final population. """
+    view: dict = {"mode": gol.VIEW_NONE}  # Nothing is rendered, so there is no need to size the view
+    current_population: dict = _population
+    for _ in range(0, _generations):
+        current_population = gol.update_world(current_population, _world_size, view)
+    return current_population
+
+
+def main():
+    """ The headless program execution. """
+    parser = gol.create_arg_parser(__desc__, "the working directory")
+    parser.add_argument('-o', '--output', dest='output', type=str, default='gol_final.json',
+                        help='File to write the final state to, relative to the working directory. '
+                             'Defaults to gol_final.json.')
+
+    args = parser.parse_args()
+    # Resolve the seed file against the working directory too, so that an output can be fed back as a seed
+    population, world_size = gol.create_seed_from_args(args, Path.cwd())
+
+    start: float = perf_counter()
+    population = fast_forward(args.generations, population, world_size)
+    elapsed: float = perf_counter() - start
+
+    # Resolve the output against the working directory, rather than the resource folder
+    file_path = gol.save_population_to_file(str(Path.cwd() / args.output), population, world_size)
+
+    counts: dict = gol.count_states(population)
+    cell_updates: int = counts["population"] * args.generations  # Every cell inside of the rim, each generation
+    print(f"Final state written to {file_path.resolve()} \n"
+          f"  World size: {world_size[0]}x{world_size[1]} \n"
+          f"  Generations: {args.generations} \n"
+          f"  Population: {counts['population']} \n"
+          f"  Alive: {counts['alive']} \n"
+          f"  Elders: {counts['elders']} \n"
+          f"  Prime Elders: {counts['prime_elders']} \n"
+          f"  Dead: {counts['dead']} \n"
+          f"  Elapsed: {elapsed:.3f} s \n"
+          f"  Generations/sec: {args.generations / elapsed if elapsed else 0:.1f} \n"
+          f"  Cell updates/sec: {cell_updates / elapsed if elapsed else 0:.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+"""
+Interactive Game of Life with a selectable view, for worlds larger than the terminal.
+
+The seed is created from the same arguments as the headless fast-forward, and the simulation runs
+the same way as in gol.py. The world is rendered through a view sized to the terminal:
+
+    full      - every cell of the world
+    viewport  - a window of the world, at a fixed origin or following the population centroid
+    zoom      - the whole world zoomed out, each glyph showing the density of a block of cells
+
+You run this script as a module:
+    python -m Project.viewer
+"""
+
+import Project.gol as gol
+
+__desc__ = "A simplified implementation of Conway's Game of Life, with a selectable view."
+
+
+def main():
+    """ The program execution with a selectable view. """
+    parser = gol.create_arg_parser(__desc__)
+    parser.add_argument('-v', '--view', dest='view', type=str,
+                        choices=[gol.VIEW_FULL, gol.VIEW_VIEWPORT, gol.VIEW_ZOOM],
+                        help='How to render the world. If omitted, the whole world is rendered if it fits the '
+                             'terminal, otherwise a viewport following the population centroid.')
+    parser.add_argument('-or', '--origin', dest='origin', type=str,
+                        help='Top left corner of the viewport, in terms of row and col. '
+                             'If omitted, the viewport follows the population centroid.')
+
+    args = parser.parse_args()
+    if args.origin and args.view in (gol.VIEW_FULL, gol.VIEW_ZOOM):  # An origin only makes sense for a viewport
+        parser.error(f"argument -or/--origin: not allowed with -v/--view {args.view}")
+
+    population, world_size = gol.create_seed_from_args(args)
+
+    mode: str = args.view if args.view or not args.origin else gol.VIEW_VIEWPORT  # An origin implies a viewport
+    # Without a mode, create_view picks the whole world or a viewport depending on the terminal
+    view: dict = gol.create_view(world_size, mode, gol.parse_coords_arg(args.origin, "Origin"))
+    gol.run_simulation(args.generations, population, world_size, view)
+
+
+if __name__ == "__main__":
+    main()